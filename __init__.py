@@ -1,5 +1,7 @@
 from .objects import *
 from .planner import *
 from .problem import *
+from .render import *
 from .scenario import *
+from .trace import *
 from .vehicle import *
\ No newline at end of file
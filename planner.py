@@ -1,11 +1,14 @@
 """Defines the interface and data structure used by the planner."""
 
-from .vehicle import VehicleState, VehicleNode, VehicleProperties
+from .vehicle import VehicleState, VehicleInput, VehicleNode, VehicleProperties
 from .scenario import ParkingScenario
+from .trace import TraceRecorder
 
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional
 import abc
+import numpy as np
 from matplotlib import axes
 
 class PlanningStartPose(VehicleState):
@@ -30,7 +33,57 @@ class PlanningGoalPose:
             abs(state.yaw_rad - self.goal.yaw_rad) <= self.tolerance.yaw_rad
         
 class Planner(abc.ABC):
-    """The interface for a planner."""
+    """The interface for a planner.
+    
+    Implementations of plan should call _record_root and _record_expansion so that the search
+    is recorded while trace_recorder is set. The recorder stays attached until it is reset, so
+    prefer attaching it with tracing, which detaches it again when the block exits.
+    """
+    trace_recorder: Optional[TraceRecorder] = None
+    _trace_parent_id: int = -1
+
+    @contextmanager
+    def tracing(self, recorder: TraceRecorder) -> Iterator[TraceRecorder]:
+        """Record every call to plan inside the with block to the given recorder.
+        
+        The previously attached recorder, if any, is restored when the block exits.
+        """
+        previous_recorder = self.trace_recorder
+        self.trace_recorder = recorder
+        try:
+            yield recorder
+        finally:
+            self.trace_recorder = previous_recorder
+
+    def _record_root(self, state: VehicleState) -> Optional[int]:
+        """Record the root node of a search if a trace recorder is set and return its trace id."""
+        if self.trace_recorder is None:
+            return None
+
+        self._trace_parent_id = self.trace_recorder.record(-1, state, None, 0.0, False)
+        return self._trace_parent_id
+
+    def _record_expansion(self, state: VehicleState, input: VehicleInput, cost: float, in_collision: bool, parent_id: Optional[int] = None) -> Optional[int]:
+        """Record the expansion of a node if a trace recorder is set.
+        
+        Args:
+            state: the state of the expanded node.
+            input: the input applied to the parent to reach this node.
+            cost: the cost of the node.
+            in_collision: the result of the collision check of the node.
+            parent_id: the trace id of the parent. Defaults to the last recorded node that is not in collision, or -1 if there is none.
+            
+        Returns:
+            The trace id of the node, or None if no trace recorder is set.
+        """
+        if self.trace_recorder is None:
+            return None
+
+        node_id = self.trace_recorder.record(self._trace_parent_id if parent_id is None else parent_id, state, input, cost, in_collision)
+        if not in_collision:
+            self._trace_parent_id = node_id
+
+        return node_id
 
     @abc.abstractmethod
     def plan(self, ego: VehicleProperties, start: VehicleState, goal: PlanningGoalPose, scenario: ParkingScenario) -> Optional[VehicleNode]:
@@ -38,6 +91,22 @@ class Planner(abc.ABC):
         return None
     
     @abc.abstractmethod
-    def render(self, ax: axes.Axes, ego: VehicleProperties) -> None:
-        """Render the planning process and result."""
+    def get_expanded_states(self) -> np.ndarray:
+        """Return the states expanded by the last call to plan in expansion order.
+
+        Returns:
+            Array of shape (N, 3), each row being [x_m, y_m, yaw_rad].
+        """
+        return np.zeros((0, 3))
+
+    @abc.abstractmethod
+    def render(self, ax: axes.Axes, ego: VehicleProperties, max_num_footprints: Optional[int] = None, num_expanded: Optional[int] = None) -> None:
+        """Render the planning process and result.
+        
+        Args:
+            ax: the matplotlib axes to render on.
+            ego: the vehicle properties used for planning.
+            max_num_footprints: level of detail; at most this many vehicle footprints are rendered.
+            num_expanded: if given, only the first num_expanded expanded states are rendered, e.g. for a frame of an animation.
+        """
         pass
\ No newline at end of file
@@ -4,7 +4,7 @@ from .. import *
 
 from typing import List
 import numpy as np
-from shapely import transform, Polygon
+from shapely import Polygon
 import math
 
 class StraightLinePlanner(Planner):
@@ -22,15 +22,19 @@ class StraightLinePlanner(Planner):
         
         num_iter = 0
         self._expanded_nodes: List[VehicleNode] = [VehicleNode(state = start)]
+        self._record_root(start)
 
         while num_iter < self._max_num_steps and not goal.in_goal_region(self._expanded_nodes[-1].state):
             num_iter += 1
+            input = VehicleInput(self._ds, 0.0, 0.0)
             next_state = self._expanded_nodes[-1].state.step(
                 property = ego,
-                input = VehicleInput(self._ds, 0.0, 0.0)
+                input = input
             )
 
-            if scenario.in_collision(next_state, ego.geometry):
+            in_collision = scenario.in_collision(next_state, ego.geometry)
+            self._record_expansion(next_state, input, num_iter * self._ds, in_collision)
+            if in_collision:
                 break
 
             self._expanded_nodes.append(
@@ -42,17 +46,17 @@ class StraightLinePlanner(Planner):
 
         return self._expanded_nodes[-1] if goal.in_goal_region(self._expanded_nodes[-1].state) else None
     
-    def render(self, ax: axes.Axes, ego: VehicleProperties) -> None:
+    def get_expanded_states(self) -> np.ndarray:
+        """Return the states expanded by the last call to plan in expansion order."""
+        expanded_nodes = getattr(self, '_expanded_nodes', [])
+        return np.array([[node.state.x_m, node.state.y_m, node.state.yaw_rad] for node in expanded_nodes]).reshape(-1, 3)
+
+    def render(self, ax: axes.Axes, ego: VehicleProperties, max_num_footprints: Optional[int] = None, num_expanded: Optional[int] = None) -> None:
         """Render the planning process and result."""
-        for idx, node in enumerate(self._expanded_nodes):
-            
-            if idx % 10 == 0 or idx == len(self._expanded_nodes) - 1:
-                def transform_polygon(data: np.ndarray) -> np.ndarray:
-                    """Transform the polygon from ego frame to world frame."""
-                    data_T = data.T
-                    augmented_data = np.vstack([data_T, np.ones((1, data_T.shape[1]))])
-                    transformed_augmented_data = node.state.to_matrix().dot(augmented_data)[:-1, :]
-                    return transformed_augmented_data.T
-
-                transformed_ego_geometry = transform(ego.geometry, transform_polygon)
-                ax.plot(*transformed_ego_geometry.exterior.xy, 'b')
+        states = self.get_expanded_states()
+        # decimate the whole search so that consecutive frames render the same footprints
+        indices = decimate(len(states), max_num_footprints)
+        if num_expanded is not None:
+            indices = indices[indices < num_expanded]
+
+        render_footprints(ax, states[indices], ego.geometry)
@@ -3,9 +3,12 @@
 from .planner import Planner, PlanningStartPose, PlanningGoalPose
 from .scenario import ParkingScenario
 from .vehicle import VehicleNode, VehicleProperties
+from .render import create_headless_axes
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
+import math
+import os
 import matplotlib.pyplot as plt
 
 @dataclass(frozen=True)
@@ -24,10 +27,61 @@ class PlanningProblem:
         """Solves the planning problem."""
         return self.planner.plan(self.ego, self.start_pose, self.goal_pose, self.scenario)
     
-    def render(self) -> None:
-        """Render the scenario, the planning process and the solution."""
-        plt.figure()
-        ax = plt.gca()
-        self.scenario.render(ax)
-        self.planner.render(ax, self.ego)
-        plt.show()
+    def render(self, filename: Optional[str] = None, max_num_footprints: Optional[int] = 1000, as_image: bool = False) -> None:
+        """Render the scenario, the planning process and the solution.
+        
+        Args:
+            filename: if given, the figure is saved to this file without a display instead of being shown.
+            max_num_footprints: level of detail; at most this many vehicle footprints are rendered.
+            as_image: if True, render the occupancy map as one image instead of rendering each object.
+        """
+        if filename is None:
+            figure = plt.figure()
+            ax = figure.gca()
+        else:
+            figure, ax = create_headless_axes()
+
+        self.scenario.render(ax, as_image)
+        self.planner.render(ax, self.ego, max_num_footprints)
+
+        if filename is None:
+            plt.show()
+        else:
+            figure.savefig(filename)
+
+    def export_frames(self, directory: str, num_frames: int, max_num_footprints: Optional[int] = 1000, as_image: bool = False) -> List[str]:
+        """Export the planning process as a sequence of PNG frames without a display.
+        
+        Each frame renders the states expanded up to that point of the search. The frames can
+        be assembled into a video with external tools, e.g. ffmpeg -i frame_%05d.png.
+        
+        Args:
+            directory: the directory to write the frames to. It is created if it doesn't exist.
+            num_frames: the number of frames to export.
+            max_num_footprints: level of detail; at most this many vehicle footprints are rendered per frame.
+            as_image: if True, render the occupancy map as one image instead of rendering each object.
+            
+        Returns:
+            The paths of the exported frames.
+        """
+        if num_frames < 1:
+            raise ValueError('The number of frames must be positive.')
+
+        num_expanded = len(self.planner.get_expanded_states())
+        figure, ax = create_headless_axes()
+        self.scenario.render(ax, as_image)
+        scenario_artists = set(ax.get_children())
+
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for frame in range(num_frames):
+            self.planner.render(ax, self.ego, max_num_footprints, math.ceil((frame + 1) * num_expanded / num_frames))
+            path = os.path.join(directory, 'frame_{:05d}.png'.format(frame))
+            figure.savefig(path)
+            paths.append(path)
+
+            # only the scenario is kept for the next frame
+            for artist in set(ax.get_children()) - scenario_artists:
+                artist.remove()
+
+        return paths
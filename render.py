@@ -0,0 +1,99 @@
+"""Batched and headless rendering utilities for scenarios and planning processes."""
+
+from .objects import ObjectType, ParkedCar
+
+from typing import Dict, Optional, Tuple
+import numpy as np
+from shapely import Polygon
+from matplotlib import axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+
+OBJECT_TYPE_COLORS: Dict[ObjectType, str] = {
+    ObjectType.UNKNOWN: 'w',
+    ObjectType.PARKING_SPOT: '0.8',
+    ObjectType.CAR: ParkedCar.render_color,
+}
+
+def decimate(num_items: int, max_num_items: Optional[int]) -> np.ndarray:
+    """Return indices of at most max_num_items evenly spaced items.
+
+    The last item is always kept so that the end of the search is visible, and so is the
+    first one unless max_num_items is 1. If max_num_items is None, all indices are returned.
+
+    Raises:
+        ValueError if max_num_items is not positive.
+    """
+    if max_num_items is not None and max_num_items < 1:
+        raise ValueError('The maximum number of items must be positive.')
+
+    if max_num_items is None or num_items <= max_num_items:
+        return np.arange(num_items)
+
+    if max_num_items == 1:
+        return np.array([num_items - 1])
+
+    return np.unique(np.round(np.linspace(0, num_items - 1, max_num_items)).astype(int))
+
+def transform_geometry(states: np.ndarray, geometry: Polygon) -> np.ndarray:
+    """Transform the exterior of the geometry from ego frame to world frame for all states at once.
+
+    Args:
+        states: array of shape (N, 3), each row being [x_m, y_m, yaw_rad].
+        geometry: the polygon defined in ego frame.
+
+    Returns:
+        Array of shape (N, K, 2) where K is the number of exterior vertices of the geometry.
+    """
+    states = np.asarray(states, dtype=float).reshape(-1, 3)
+    vertices = np.asarray(geometry.exterior.coords)  # (K, 2)
+    cos_yaw = np.cos(states[:, 2])[:, None]
+    sin_yaw = np.sin(states[:, 2])[:, None]
+
+    x = cos_yaw * vertices[:, 0] - sin_yaw * vertices[:, 1] + states[:, 0:1]
+    y = sin_yaw * vertices[:, 0] + cos_yaw * vertices[:, 1] + states[:, 1:2]
+    return np.stack([x, y], axis=-1)
+
+def render_footprints(ax: axes.Axes, states: np.ndarray, geometry: Polygon, max_num_footprints: Optional[int] = None, color: str = 'b') -> LineCollection:
+    """Render the footprints of the vehicle at the given states as one line collection.
+
+    Args:
+        ax: the matplotlib axes to render on.
+        states: array of shape (N, 3), each row being [x_m, y_m, yaw_rad].
+        geometry: the vehicle geometry defined in ego frame.
+        max_num_footprints: level of detail; the states are decimated to at most this many footprints.
+        color: the color of the footprints.
+    """
+    states = np.asarray(states, dtype=float).reshape(-1, 3)
+    selected_states = states[decimate(len(states), max_num_footprints)]
+    collection = LineCollection(transform_geometry(selected_states, geometry), colors=color)
+    ax.add_collection(collection)
+    return collection
+
+def render_occupancy_map(ax: axes.Axes, parking_map: np.ndarray, grid_size_m: float) -> None:
+    """Render the semantic map of a scenario as a single image.
+
+    Args:
+        ax: the matplotlib axes to render on.
+        parking_map: the 2d map whose rows follow the x-axis and columns follow the y-axis.
+        grid_size_m: the grid size of the map.
+    """
+    image = np.zeros(parking_map.shape + (4,))
+    for object_type, color in OBJECT_TYPE_COLORS.items():
+        image[parking_map == object_type] = to_rgba(color)
+
+    num_rows, num_cols = parking_map.shape
+    ax.imshow(
+        image.transpose(1, 0, 2),  # imshow expects rows along the y-axis
+        origin = 'lower',
+        extent = (0.0, num_rows * grid_size_m, 0.0, num_cols * grid_size_m),
+        interpolation = 'nearest'
+    )
+
+def create_headless_axes() -> Tuple[Figure, axes.Axes]:
+    """Create a figure backed by the Agg canvas, which works without any display."""
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    return figure, figure.add_subplot()
@@ -3,6 +3,7 @@
 from .objects import *
 from .vehicle import VehicleState, VehicleProperties
 from .objects import convert_index_to_xy
+from .render import render_occupancy_map
 
 from dataclasses import dataclass
 from typing import List
@@ -70,10 +71,19 @@ class ParkingScenario:
         
         return False
     
-    def render(self, ax: axes.Axes) -> None:
-        """Render all objects in this scenario on the given axes."""
-        ax.set_xlim((0.0, (self._map.shape[0] + 1) * self._grid_size_m))
-        ax.set_ylim((0.0, (self._map.shape[1] + 1) * self._grid_size_m))
+    def render(self, ax: axes.Axes, as_image: bool = False) -> None:
+        """Render all objects in this scenario on the given axes.
+        
+        Args:
+            ax: the matplotlib axes to render on.
+            as_image: if True, render the occupancy map as one image instead of rendering each object.
+        """
+        if as_image:
+            render_occupancy_map(ax, self._map, self._grid_size_m)
+        else:
+            for object in self._objects:
+                object.render(ax)
 
-        for object in self._objects:
-            object.render(ax)
\ No newline at end of file
+        # set the limits last since imshow resets them to the image extent
+        ax.set_xlim((0.0, (self._map.shape[0] + 1) * self._grid_size_m))
+        ax.set_ylim((0.0, (self._map.shape[1] + 1) * self._grid_size_m))
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""Test everything in render.py."""
+
+from ..render import *
+from ..problem import *
+from ..objects import ParkedCar
+from ..scenario import ParkingScenario, ParkingScenarioParameters
+from ..vehicle import VehicleState, VehicleProperties
+from ..planners.straight_line_planner import StraightLinePlanner
+
+import math
+import os
+import pytest
+from shapely import transform
+
+def test_decimate():
+    """Check if decimation keeps the first and the last item and respects the limit."""
+    assert np.array_equal(decimate(5, None), np.arange(5))
+    assert np.array_equal(decimate(5, 10), np.arange(5))
+    assert np.array_equal(decimate(5, 1), [4])
+
+    indices = decimate(1000, 10)
+    assert len(indices) == 10
+    assert indices[0] == 0 and indices[-1] == 999
+
+    with pytest.raises(ValueError):
+        decimate(5, 0)
+
+    with pytest.raises(ValueError):
+        decimate(0, 0)
+
+def test_transform_geometry():
+    """Check if the vectorized transform matches the per state transform."""
+    geometry = Polygon([(-1, -1), (-1, 1), (3, 1), (3, -1)])
+    states = [VehicleState(x_m = 1.0, y_m = 2.0, yaw_rad = 0.3), VehicleState(x_m = -4.0, y_m = 0.5, yaw_rad = -2.0)]
+    footprints = transform_geometry(np.array([[s.x_m, s.y_m, s.yaw_rad] for s in states]), geometry)
+    assert footprints.shape == (2, 5, 2)
+
+    for state, footprint in zip(states, footprints):
+        def transform_polygon(data: np.ndarray) -> np.ndarray:
+            """Transform the polygon from ego frame to world frame."""
+            augmented_data = np.vstack([data.T, np.ones((1, data.shape[0]))])
+            return state.to_matrix().dot(augmented_data)[:-1, :].T
+
+        expected = np.asarray(transform(geometry, transform_polygon).exterior.coords)
+        assert np.allclose(footprint, expected)
+
+def test_render_occupancy_map():
+    """Check if the occupancy map is rendered as one image with cells at the right positions."""
+    parking_map = np.zeros((4, 3), dtype=int)
+    parking_map[3][0] = ObjectType.CAR  # x in [3, 4], y in [0, 1]
+    parking_map[0][2] = ObjectType.PARKING_SPOT  # x in [0, 1], y in [2, 3]
+
+    figure, ax = create_headless_axes()
+    render_occupancy_map(ax, parking_map, 1.0)
+    assert len(ax.images) == 1
+    assert ax.images[0].get_extent() == [0.0, 4.0, 0.0, 3.0]
+
+    # with origin='lower', image row i spans y in [i, i + 1] and image column j spans x in [j, j + 1]
+    image = ax.images[0].get_array()
+    assert image.shape == (3, 4, 4)
+    assert np.allclose(image[0][3], to_rgba(ParkedCar.render_color))
+    assert np.allclose(image[2][0], to_rgba(OBJECT_TYPE_COLORS[ObjectType.PARKING_SPOT]))
+    assert np.allclose(image[1][1], to_rgba(OBJECT_TYPE_COLORS[ObjectType.UNKNOWN]))
+
+def test_headless_export(tmp_path):
+    """Check if the planning process can be rendered and exported without a display."""
+    scenario = ParkingScenario(
+        params = ParkingScenarioParameters(num_rows = 20, num_cols = 20, grid_size_m = 1.0)
+    )
+    scenario.add_object(ParkedCar(bounding_box_m = Polygon([(1, 1), (1, 3), (3, 3), (3, 1)])))
+    epsilon = 0.15
+    problem = PlanningProblem(
+        ego = VehicleProperties(wheelbase_m = 3.0, geometry = Polygon([(-1, -1), (-1, 1), (3, 1), (3, -1)])),
+        scenario = scenario,
+        planner = StraightLinePlanner(ds = 0.5, max_num_steps = 100),
+        start_pose = PlanningStartPose(x_m = 10.0, y_m = 2.0, yaw_rad = math.pi / 2.0),
+        goal_pose = PlanningGoalPose(
+            goal = VehicleState(x_m = 10.0, y_m = 12.0, yaw_rad = math.pi / 2.0),
+            tolerance = VehicleState(x_m = epsilon, y_m = epsilon, yaw_rad = epsilon)
+        )
+    )
+    assert problem.solve() is not None
+    assert problem.planner.get_expanded_states().shape == (21, 3)
+
+    figure, ax = create_headless_axes()
+    problem.planner.render(ax, problem.ego, num_expanded = 3)
+    assert len(ax.collections[0].get_segments()) == 3
+
+    # every frame extends the footprints of the previous one
+    previous_footprints = set()
+    for num_expanded in range(1, 22):
+        figure, ax = create_headless_axes()
+        problem.planner.render(ax, problem.ego, max_num_footprints = 5, num_expanded = num_expanded)
+        footprints = {segment.tobytes() for segment in ax.collections[0].get_segments()}
+        assert previous_footprints <= footprints
+        previous_footprints = footprints
+
+    assert len(previous_footprints) == 5
+
+    filename = str(tmp_path / 'solution.png')
+    problem.render(filename = filename, max_num_footprints = 5)
+    assert os.path.getsize(filename) > 0
+
+    frames = problem.export_frames(str(tmp_path / 'frames'), num_frames = 3)
+    assert len(frames) == 3
+    assert all(os.path.getsize(frame) > 0 for frame in frames)
+
+    with pytest.raises(ValueError):
+        problem.export_frames(str(tmp_path / 'frames'), num_frames = 0)
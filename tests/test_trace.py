@@ -0,0 +1,136 @@
+"""Test everything in trace.py."""
+
+from ..trace import *
+from ..problem import *
+from ..objects import ParkedCar
+from ..scenario import ParkingScenario, ParkingScenarioParameters
+from ..vehicle import VehicleProperties
+from ..planners.straight_line_planner import StraightLinePlanner
+
+import math
+import pytest
+
+def test_trace_round_trip(tmp_path):
+    """Check if recorded events are read back in order, including the ones still buffered on close."""
+    filename = str(tmp_path / 'trace.bin')
+    with TraceRecorder(filename, chunk_size = 2) as recorder:
+        root_id = recorder.record(-1, VehicleState(), None, 0.0, False)
+        child_id = recorder.record(root_id, VehicleState(x_m = 1.0), VehicleInput(1.0, 0.1, 0.0), 1.0, False)
+        leaf_id = recorder.record(child_id, VehicleState(x_m = 2.0), VehicleInput(1.0, 0.0, 0.0), 2.0, True)
+
+    with pytest.raises(ValueError):
+        recorder.record(leaf_id, VehicleState(), VehicleInput(), 3.0, False)
+
+    reader = TraceReader(filename)
+    assert len(reader) == 3
+    assert list(reader.events['node_id']) == [root_id, child_id, leaf_id]
+    assert np.isnan(reader.events[0]['distance_moved_m'])
+    assert reader.events[1]['front_wheel_angle_rad'] == 0.1
+    assert reader.get_path(leaf_id) == [root_id, child_id, leaf_id]
+    assert reader.get_states().shape == (2, 3)
+    assert reader.get_states(include_collisions = True).shape == (3, 3)
+    assert [len(chunk) for chunk in reader.iter_chunks(chunk_size = 2)] == [2, 1]
+
+    statistics = reader.get_statistics()
+    assert statistics['num_events'] == 3
+    assert statistics['num_roots'] == 1
+    assert statistics['num_collisions'] == 1
+    assert statistics['max_cost'] == 2.0
+
+    with pytest.raises(ValueError):
+        reader.get_path(3)
+
+    reader.close()
+    assert len(reader) == 0
+
+    # views that outlive the with block must not prevent the reader from closing
+    with TraceReader(filename) as reader:
+        last_event = reader.events[-1]
+        for chunk in reader.iter_chunks(chunk_size = 2):
+            break
+
+    assert len(chunk) == 2 and chunk[0]['node_id'] == root_id
+    assert last_event['node_id'] == leaf_id
+
+def test_invalid_trace(tmp_path):
+    """Check if empty traces are accepted and files that are not traces are rejected."""
+    filename = str(tmp_path / 'empty.bin')
+    TraceRecorder(filename).close()
+    with TraceReader(filename) as reader:
+        assert len(reader) == 0
+
+    filename = str(tmp_path / 'invalid.bin')
+    with open(filename, 'wb') as file:
+        file.write(b'not a trace file')
+
+    with pytest.raises(ValueError):
+        TraceReader(filename)
+
+    with pytest.raises(ValueError):
+        TraceRecorder(str(tmp_path / 'trace.bin'), chunk_size = 0)
+
+    # a parent recorded after its child must not make get_path loop forever
+    filename = str(tmp_path / 'corrupt.bin')
+    with TraceRecorder(filename) as recorder:
+        recorder.record(1, VehicleState(), None, 0.0, False)
+        recorder.record(0, VehicleState(), None, 0.0, False)
+
+    with TraceReader(filename) as reader:
+        with pytest.raises(ValueError):
+            reader.get_path(1)
+
+def test_record_expansion_without_root(tmp_path):
+    """Check if an expansion recorded before any root becomes a root itself."""
+    planner = StraightLinePlanner(ds = 0.5, max_num_steps = 10)
+    filename = str(tmp_path / 'trace.bin')
+    with TraceRecorder(filename) as recorder, planner.tracing(recorder):
+        assert planner._record_expansion(VehicleState(), VehicleInput(), 0.5, False) == 0
+
+    with TraceReader(filename) as reader:
+        assert reader.events[0]['parent_id'] == -1
+
+def test_planner_trace(tmp_path):
+    """Check if the planner records every expansion and the trace is deterministic."""
+    scenario = ParkingScenario(
+        params = ParkingScenarioParameters(num_rows = 20, num_cols = 20, grid_size_m = 1.0)
+    )
+    scenario.add_object(ParkedCar(bounding_box_m = Polygon([(9, 10), (9, 12), (11, 12), (11, 10)])))
+    epsilon = 0.15
+    problem = PlanningProblem(
+        ego = VehicleProperties(wheelbase_m = 3.0, geometry = Polygon([(-1, -1), (-1, 1), (3, 1), (3, -1)])),
+        scenario = scenario,
+        planner = StraightLinePlanner(ds = 0.5, max_num_steps = 100),
+        start_pose = PlanningStartPose(x_m = 10.0, y_m = 2.0, yaw_rad = math.pi / 2.0),
+        goal_pose = PlanningGoalPose(
+            goal = VehicleState(x_m = 10.0, y_m = 15.0, yaw_rad = math.pi / 2.0),
+            tolerance = VehicleState(x_m = epsilon, y_m = epsilon, yaw_rad = epsilon)
+        )
+    )
+
+    traces = []
+    for idx in range(2):
+        filename = str(tmp_path / 'trace_{}.bin'.format(idx))
+        with TraceRecorder(filename) as recorder, problem.planner.tracing(recorder):
+            assert problem.solve() is None
+        traces.append(filename)
+
+    # the recorder is detached once the with block exits
+    assert problem.planner.trace_recorder is None
+    assert problem.solve() is None
+
+    # nested blocks restore the outer recorder
+    with TraceRecorder(str(tmp_path / 'outer.bin')) as outer, TraceRecorder(str(tmp_path / 'inner.bin')) as inner:
+        with problem.planner.tracing(outer):
+            with problem.planner.tracing(inner):
+                assert problem.planner.trace_recorder is inner
+            assert problem.planner.trace_recorder is outer
+    assert problem.planner.trace_recorder is None
+
+    with open(traces[0], 'rb') as first, open(traces[1], 'rb') as second:
+        assert first.read() == second.read()
+
+    with TraceReader(traces[0]) as reader:
+        assert len(reader) == len(problem.planner.get_expanded_states()) + 1
+        assert reader.events[-1]['in_collision']
+        assert not reader.events[:-1]['in_collision'].any()
+        assert reader.get_path(len(reader) - 1) == list(range(len(reader)))
@@ -0,0 +1,202 @@
+"""Record the expansion events of a search to a binary file and load them back for offline analysis."""
+
+from .vehicle import VehicleState, VehicleInput
+from .render import render_footprints
+
+from typing import Dict, Iterator, List, Optional, Union
+import struct
+import numpy as np
+from shapely import Polygon
+from matplotlib import axes
+
+TRACE_MAGIC = b'PPTRACE1'
+TRACE_HEADER_FORMAT = '<8sQ'  # magic, size of one event in bytes
+TRACE_HEADER_SIZE = struct.calcsize(TRACE_HEADER_FORMAT)
+TRACE_EVENT_DTYPE = np.dtype([
+    ('node_id', '<i8'),
+    ('parent_id', '<i8'),  # -1 for root nodes
+    ('x_m', '<f8'),
+    ('y_m', '<f8'),
+    ('yaw_rad', '<f8'),
+    ('distance_moved_m', '<f8'),  # input fields are NaN for root nodes
+    ('front_wheel_angle_rad', '<f8'),
+    ('rear_wheel_angle_rad', '<f8'),
+    ('cost', '<f8'),
+    ('in_collision', '?'),
+])
+
+def _get_states(events: np.ndarray) -> np.ndarray:
+    """Stack the poses of the events into an array of shape (N, 3), each row being [x_m, y_m, yaw_rad]."""
+    return np.stack([events['x_m'], events['y_m'], events['yaw_rad']], axis=-1)
+
+class TraceRecorder:
+    """Streams expansion events to a trace file.
+
+    Events are buffered in a fixed size chunk which is written to the file once it is full,
+    so memory usage is bounded regardless of the number of events. Node ids are assigned in
+    recording order, which makes traces of deterministic planners reproducible byte by byte.
+    """
+
+    def __init__(self, filename: str, chunk_size: int = 4096) -> None:
+        """Open the trace file for writing.
+
+        Args:
+            filename: the file to write the trace to. It is overwritten if it exists.
+            chunk_size: the number of events buffered before they are written to the file.
+        """
+        if chunk_size < 1:
+            raise ValueError('The chunk size must be positive.')
+
+        self._file = open(filename, 'wb')
+        self._file.write(struct.pack(TRACE_HEADER_FORMAT, TRACE_MAGIC, TRACE_EVENT_DTYPE.itemsize))
+        self._buffer = np.zeros(chunk_size, dtype=TRACE_EVENT_DTYPE)
+        self._num_buffered = 0
+        self._num_events = 0
+
+    def record(self, parent_id: int, state: VehicleState, input: Optional[VehicleInput], cost: float, in_collision: bool) -> int:
+        """Record the expansion of one node and return the id assigned to it.
+
+        Args:
+            parent_id: the id returned when the parent was recorded, or -1 for a root node.
+            state: the state of the expanded node.
+            input: the input applied to the parent to reach this node, None for a root node.
+            cost: the cost of the node.
+            in_collision: the result of the collision check of the node.
+
+        Raises:
+            ValueError if the recorder is closed.
+        """
+        if self._file.closed:
+            raise ValueError('Cannot record to a closed trace recorder.')
+
+        node_id = self._num_events
+        if input is None:
+            input_values = (np.nan, np.nan, np.nan)
+        else:
+            input_values = (input.distance_moved_m, input.front_wheel_angle_rad, input.rear_wheel_angle_rad)
+
+        self._buffer[self._num_buffered] = (node_id, parent_id, state.x_m, state.y_m, state.yaw_rad, *input_values, cost, in_collision)
+        self._num_buffered += 1
+        self._num_events += 1
+
+        if self._num_buffered == len(self._buffer):
+            self.flush()
+
+        return node_id
+
+    def flush(self) -> None:
+        """Write all buffered events to the file."""
+        self._file.write(self._buffer[:self._num_buffered].tobytes())
+        self._file.flush()
+        self._num_buffered = 0
+
+    def close(self) -> None:
+        """Flush the buffered events and close the file."""
+        if self._file.closed:
+            return
+
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> 'TraceRecorder':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+class TraceReader:
+    """Loads a trace file lazily by memory-mapping it.
+
+    Arrays returned by the reader may be views into the mapped file, which stays mapped
+    until the reader is closed and all such views are released.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Map the trace file into memory.
+
+        Raises:
+            ValueError if the file is not a trace file or was written with a different event layout.
+        """
+        with open(filename, 'rb') as file:
+            header = file.read(TRACE_HEADER_SIZE)
+            file.seek(0, 2)
+            file_size = file.tell()
+
+        if len(header) != TRACE_HEADER_SIZE:
+            raise ValueError('The file is too short to be a trace file.')
+
+        magic, event_size = struct.unpack(TRACE_HEADER_FORMAT, header)
+        if magic != TRACE_MAGIC:
+            raise ValueError('The file is not a trace file.')
+
+        if event_size != TRACE_EVENT_DTYPE.itemsize:
+            raise ValueError('The trace file was written with an incompatible event layout.')
+
+        # an incomplete event at the end of the file (e.g. after a crash) is ignored
+        num_events = (file_size - TRACE_HEADER_SIZE) // TRACE_EVENT_DTYPE.itemsize
+        if num_events == 0:
+            self.events = np.zeros(0, dtype=TRACE_EVENT_DTYPE)
+        else:
+            self.events = np.memmap(filename, dtype=TRACE_EVENT_DTYPE, mode='r', offset=TRACE_HEADER_SIZE, shape=(num_events,))
+
+    def close(self) -> None:
+        """Release the reader's reference to the mapped file.
+
+        The file is unmapped once no view returned by the reader is alive anymore.
+        """
+        self.events = np.zeros(0, dtype=TRACE_EVENT_DTYPE)
+
+    def __enter__(self) -> 'TraceReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def iter_chunks(self, chunk_size: int = 4096) -> Iterator[np.ndarray]:
+        """Replay the events in recording order, chunk by chunk."""
+        for start in range(0, len(self.events), chunk_size):
+            yield self.events[start:start + chunk_size]
+
+    def get_states(self, include_collisions: bool = False) -> np.ndarray:
+        """Return the states of the events as an array of shape (N, 3), each row being [x_m, y_m, yaw_rad]."""
+        events = self.events if include_collisions else self.events[~self.events['in_collision']]
+        return _get_states(events)
+
+    def get_path(self, node_id: int) -> List[int]:
+        """Return the ids of the nodes from the root to the given node.
+
+        Raises:
+            ValueError if the node id is out of range or the trace is corrupt.
+        """
+        if node_id < 0 or node_id >= len(self.events):
+            raise ValueError('Node id {} is out of range.'.format(node_id))
+
+        path = []
+        while node_id >= 0:
+            path.append(node_id)
+            parent_id = int(self.events[node_id]['parent_id'])
+            if parent_id >= node_id:
+                raise ValueError('Node {} has parent {} which was not recorded before it.'.format(node_id, parent_id))
+
+            node_id = parent_id
+
+        return path[::-1]
+
+    def get_statistics(self) -> Dict[str, Union[int, float]]:
+        """Return summary statistics of the search."""
+        num_collisions = int(np.count_nonzero(self.events['in_collision']))
+        return {
+            'num_events': len(self.events),
+            'num_roots': int(np.count_nonzero(self.events['parent_id'] < 0)),
+            'num_collisions': num_collisions,
+            'collision_rate': num_collisions / len(self.events) if len(self.events) > 0 else 0.0,
+            'max_cost': float(np.max(self.events['cost'])) if len(self.events) > 0 else 0.0,
+        }
+
+    def render(self, ax: axes.Axes, geometry: Polygon, max_num_footprints: Optional[int] = None) -> None:
+        """Render the collision free expansions in blue and the colliding ones in red."""
+        render_footprints(ax, self.get_states(), geometry, max_num_footprints)
+        render_footprints(ax, _get_states(self.events[self.events['in_collision']]), geometry, max_num_footprints, color='r')